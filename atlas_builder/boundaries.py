@@ -5,31 +5,45 @@ Transforms official constellation boundaries from B1875 (FK4) to J2000 (ICRS)
 coordinates suitable for modern visualization.
 """
 
+import hashlib
+import json
 import os
+import shutil
 from pathlib import Path
 from typing import Dict, List, Tuple
 
 import numpy as np
+import pandas as pd
 import requests
 
 from .config import (
     CDS_BOUNDARIES_URL,
+    COORDINATE_DECIMALS,
     BOUNDARY_DENSIFICATION_STEPS,
     BOUNDARY_GAP_THRESHOLD_SQ,
     SKYFIELD_DATA_DIR,
     SIMBAD_TIMEOUT_SECONDS
 )
+from .io_utils import write_atomic
 from .logging_utils import log, log_step
 
 
-# Check for Astropy availability at module load
+# Check for Astropy availability at module load.
+# Precession calls ERFA directly; pyerfa is installed as part of Astropy.
 try:
-    from astropy.coordinates import FK4, SkyCoord
-    import astropy.units as u
+    import erfa
     HAS_ASTROPY = True
 except ImportError:
     HAS_ASTROPY = False
 
+# Version of the code that produces cached boundary polygons. Part of the
+# cache key: bump it whenever densification, precession or output
+# formatting changes, so stale polygons are regenerated.
+_BOUNDARY_CACHE_VERSION = 1
+
+# Reused connection pool for boundary downloads
+_SESSION = requests.Session()
+
 
 def _download_boundary_data(data_dir: Path) -> Path:
     """
@@ -52,17 +66,28 @@ def _download_boundary_data(data_dir: Path) -> Path:
     
     log(f"Downloading boundaries from {CDS_BOUNDARIES_URL}")
     
-    response = requests.get(CDS_BOUNDARIES_URL, timeout=SIMBAD_TIMEOUT_SECONDS)
-    response.raise_for_status()
+    # Stream straight to disk; rename at the end so an interrupted download
+    # never leaves a partial file that the exists() check above would accept
+    partial_path = boundary_path.with_suffix(".part")
+    
+    with _SESSION.get(
+        CDS_BOUNDARIES_URL,
+        stream=True,
+        timeout=SIMBAD_TIMEOUT_SECONDS
+    ) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        
+        with open(partial_path, 'wb') as f:
+            shutil.copyfileobj(response.raw, f)
     
-    with open(boundary_path, 'wb') as f:
-        f.write(response.content)
+    os.replace(partial_path, boundary_path)
     
     log(f"Saved to {boundary_path}", "success")
     return boundary_path
 
 
-def _parse_boundary_file(file_path: Path) -> Dict[str, List[Tuple[float, float]]]:
+def _parse_boundary_file(file_path: Path) -> Dict[str, np.ndarray]:
     """
     Parse constbnd.dat into constellation boundary polygons.
     
@@ -73,39 +98,47 @@ def _parse_boundary_file(file_path: Path) -> Dict[str, List[Tuple[float, float]]
         file_path: Path to constbnd.dat
         
     Returns:
-        Dict mapping constellation abbreviation to list of (RA, Dec) points
+        Dict mapping constellation abbreviation to an (N, 2) float64 array
+        of (RA, Dec) points
         
     Example:
-        {"ORI": [(5.5, 10.0), (5.6, 10.0), ...], ...}
+        {"ORI": array([[5.5, 10.0], [5.6, 10.0], ...]), ...}
     """
-    boundaries: Dict[str, List[Tuple[float, float]]] = {}
-    
-    with open(file_path, 'r', encoding='utf-8') as f:
-        for line in f:
-            parts = line.split()
-            
-            if len(parts) < 3:
-                continue
-            
-            try:
-                ra_hours = float(parts[0])
-                dec_degrees = float(parts[1])
-                constellation = parts[2].upper().strip()
-                
-                if constellation not in boundaries:
-                    boundaries[constellation] = []
-                
-                boundaries[constellation].append((ra_hours, dec_degrees))
-            
-            except ValueError:
-                continue
+    # Lines carry an optional 4th column (adjacent constellation); name it
+    # so the C parser doesn't treat those lines as malformed
+    df = pd.read_csv(
+        file_path,
+        sep=r'\s+',
+        header=None,
+        names=['ra', 'dec', 'const', 'adjacent'],
+        usecols=['ra', 'dec', 'const'],
+        dtype={'const': str},
+        engine='c',
+        on_bad_lines='skip'
+    )
+    
+    # Drop lines whose coordinates don't parse as numbers
+    df['ra'] = pd.to_numeric(df['ra'], errors='coerce')
+    df['dec'] = pd.to_numeric(df['dec'], errors='coerce')
+    df = df.dropna()
+    
+    # sort=False keeps constellations in file order. C order so the
+    # densification kernel can use the arrays without copying.
+    boundaries: Dict[str, np.ndarray] = {
+        constellation: np.ascontiguousarray(
+            group[['ra', 'dec']].to_numpy(dtype=np.float64)
+        )
+        for constellation, group in df.groupby(
+            df['const'].str.strip().str.upper(), sort=False
+        )
+    }
     
     log(f"Parsed {len(boundaries)} constellation boundaries")
     return boundaries
 
 
 def _densify_polygon(
-    points: List[Tuple[float, float]],
+    points: np.ndarray,
     steps: int
 ) -> Tuple[np.ndarray, np.ndarray]:
     """
@@ -115,7 +148,7 @@ def _densify_polygon(
     Handles RA wraparound at 0h/24h boundary.
     
     Args:
-        points: List of (RA_hours, Dec_degrees) tuples
+        points: (N, 2) array of (RA_hours, Dec_degrees)
         steps: Number of interpolation points per segment
         
     Returns:
@@ -126,42 +159,161 @@ def _densify_polygon(
         When projected to sky, long edges can appear curved or broken.
         Interpolation provides smooth curves after coordinate transformation.
     """
-    ra_list: List[float] = []
-    dec_list: List[float] = []
+    pts = np.ascontiguousarray(points, dtype=np.float64).reshape(-1, 2)
     
-    for i in range(len(points)):
-        p1 = points[i]
-        p2 = points[(i + 1) % len(points)]
-        
-        # Handle RA wraparound (0h <-> 24h)
-        ra1, dec1 = p1
-        ra2, dec2 = p2
-        
-        ra_dist = ra2 - ra1
-        if ra_dist > 12.0:
-            ra2 -= 24.0
-        elif ra_dist < -12.0:
-            ra2 += 24.0
-        
-        # Check for discontinuous segments (e.g., Serpens split)
-        dist_sq = (ra2 - ra1)**2 + (dec2 - dec1)**2
+    # Each vertex pairs with the next one; the last wraps to the first
+    p1 = pts
+    p2 = np.roll(pts, -1, axis=0)
+    
+    ra1, dec1 = p1[:, 0], p1[:, 1]
+    
+    # Handle RA wraparound (0h <-> 24h)
+    ra_dist = p2[:, 0] - ra1
+    ra2 = np.where(
+        ra_dist > 12.0,
+        p2[:, 0] - 24.0,
+        np.where(ra_dist < -12.0, p2[:, 0] + 24.0, p2[:, 0])
+    )
+    dec2 = p2[:, 1]
+    
+    dra = ra2 - ra1
+    ddec = dec2 - dec1
+    
+    # Check for discontinuous segments (e.g., Serpens split)
+    dist_sq = dra**2 + ddec**2
+    is_gap = dist_sq > BOUNDARY_GAP_THRESHOLD_SQ
+    
+    # Interpolate all segments at once: shape (N, steps). The outer product
+    # allocates each buffer once; offsets and wrapping are applied in place.
+    t = np.arange(steps) / steps
+    ra_interp = np.multiply.outer(dra, t)
+    ra_interp += ra1[:, None]
+    dec_interp = np.multiply.outer(ddec, t)
+    dec_interp += dec1[:, None]
+    
+    # Large gap - don't interpolate, keep only the segment start (t=0)
+    keep = ~is_gap[:, None] | (np.arange(steps) == 0)
+    
+    ra_out = ra_interp[keep]
+    ra_out += 24.0
+    np.mod(ra_out, 24.0, out=ra_out)
+    dec_out = dec_interp[keep]
+    
+    return ra_out, dec_out
+
+
+# FK4 B1950 -> FK5 J2000 rotation, Murray (1989) A&A 218, 325, eqn 28
+_FK4_B1950_TO_FK5_J2000 = np.array([
+    [0.9999256794956877, -0.0111814832204662, -0.0048590038153592],
+    [0.0111814832391717, +0.9999374848933135, -0.0000271625947142],
+    [0.0048590037723143, -0.0000271702937440, +0.9999881946023742],
+])
+
+# Correction for FK4 being a rotating system, Murray (1989) eqn 29,
+# per Julian century from 1950
+_FK4_ROTATION_CORRECTION = np.array([
+    [-0.0026455262, -1.1539918689, +2.1111346190],
+    [+1.1540628161, -0.0129042997, +0.0236021478],
+    [-2.1112979048, -0.0056024448, +0.0102587734],
+]) * 1.0e-6
+
+
+def _newcomb_precession_matrix(epoch_from: float, epoch_to: float) -> np.ndarray:
+    """
+    FK4 precession matrix between two Besselian epochs (Newcomb's method).
+    
+    ERFA only implements the IAU 1976+ precession models, so the FK4 step
+    from B1875 to B1950 is computed here. Same formulation as Astropy's
+    FK4 frame.
+    
+    Args:
+        epoch_from: Besselian epoch to precess from (e.g. 1875.0)
+        epoch_to: Besselian epoch to precess to (e.g. 1950.0)
         
-        if dist_sq > BOUNDARY_GAP_THRESHOLD_SQ:
-            # Large gap - don't interpolate, just add the point
-            ra_list.append((ra1 + 24) % 24)
-            dec_list.append(dec1)
-            continue
+    Returns:
+        3x3 rotation matrix acting on column unit vectors
+    """
+    # Millennia from 1850 (tropical years)
+    t1 = (epoch_from - 1850.0) / 1000.0
+    dt = (epoch_to - 1850.0) / 1000.0 - t1
+    
+    zeta1 = (0.060 * t1 + 139.720) * t1 + 23035.545
+    zeta = ((17.995 * dt + (-0.27 * t1 + 30.240)) * dt + zeta1) * dt
+    z = ((18.325 * dt + (109.480 + 0.39 * t1)) * dt + zeta1) * dt
+    theta1 = (-0.37 * t1 - 85.29) * t1 + 20051.12
+    theta = ((-41.8 * dt + (-0.37 * t1 - 42.65)) * dt + theta1) * dt
+    
+    # Angles above are in arcseconds
+    return erfa.rz(
+        -z * erfa.DAS2R,
+        erfa.ry(theta * erfa.DAS2R, erfa.rz(-zeta * erfa.DAS2R, np.eye(3)))
+    )
+
+
+def _fk4_e_terms(equinox_jd: float) -> np.ndarray:
+    """
+    E-terms of aberration vector for an FK4 equinox.
+    
+    Args:
+        equinox_jd: Julian date of the FK4 equinox
         
-        # Interpolate segment
-        for s in range(steps):
-            t = s / steps
-            ra_interp = ra1 + (ra2 - ra1) * t
-            dec_interp = dec1 + (dec2 - dec1) * t
-            
-            ra_list.append((ra_interp + 24) % 24)
-            dec_list.append(dec_interp)
-    
-    return np.array(ra_list), np.array(dec_list)
+    Returns:
+        Length-3 vector (Explanatory Supplement, 1992)
+    """
+    # Constant of aberration, in radians
+    k = np.radians(0.0056932)
+    
+    T = (equinox_jd - sum(erfa.epb2jd(1950.0))) / 36525.0
+    # Eccentricity of the Earth's orbit
+    ek = k * ((-0.000000126 * T - 0.00004193) * T + 0.01673011)
+    # Mean longitude of perigee of the solar orbit
+    g = np.radians((((0.012 * T + 1.65) * T + 6190.67) * T + 1015489.951) / 3600.0)
+    # Obliquity of the ecliptic
+    o = erfa.obl80(equinox_jd, 0.0)
+    
+    return np.array([
+        ek * np.sin(g),
+        -ek * np.cos(g) * np.cos(o),
+        -ek * np.cos(g) * np.sin(o),
+    ])
+
+
+def _build_b1875_to_icrs() -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the fixed FK4 B1875 -> ICRS transform.
+    
+    Both epochs are constant, so everything except the E-terms collapses
+    into one rotation matrix: Newcomb precession to B1950, FK4 -> FK5
+    J2000, then the FK5 -> ICRS frame bias. Same chain as Astropy's
+    FK4 -> ICRS transform (obstime defaults to the equinox).
+    
+    Returns:
+        Tuple of (E-terms vector, 3x3 rotation matrix on column vectors)
+    """
+    jd1, jd2 = erfa.epb2jd(1875.0)
+    e_terms = _fk4_e_terms(jd1 + jd2)
+    
+    # FK4 rotates relative to FK5; evaluate the correction at B1875
+    t = (erfa.epj(jd1, jd2) - 1950.0) / 100.0
+    fk4_to_fk5 = _FK4_B1950_TO_FK5_J2000 + _FK4_ROTATION_CORRECTION * t
+    
+    # ICRS -> FK5 J2000 frame bias (USNO Circular 179); transpose to invert
+    mas = erfa.DAS2R / 1000.0
+    icrs_to_fk5 = erfa.rx(
+        19.9 * mas, erfa.ry(9.1 * mas, erfa.rz(-22.9 * mas, np.eye(3)))
+    )
+    
+    matrix = (
+        icrs_to_fk5.T
+        @ fk4_to_fk5
+        @ _newcomb_precession_matrix(1875.0, 1950.0)
+    )
+    return e_terms, matrix
+
+
+# Computed once at import; _precess_coordinates is then pure NumPy
+if HAS_ASTROPY:
+    _B1875_E_TERMS, _B1875_TO_ICRS = _build_b1875_to_icrs()
 
 
 def _precess_coordinates(
@@ -179,6 +331,8 @@ def _precess_coordinates(
         Tuple of (RA_hours_J2000, Dec_degrees_J2000)
         
     Note:
+        Applies the transform cached at import (E-terms removal plus one
+        3x3 rotation), so no Astropy or ERFA calls happen per batch.
         Falls back to identity transform if Astropy unavailable.
         Accuracy without Astropy: ~arcminutes (acceptable for visualization).
     """
@@ -187,17 +341,51 @@ def _precess_coordinates(
             log("Astropy unavailable - skipping precession", "warn")
         return ra_hours, dec_degrees
     
-    # Convert to Astropy SkyCoord
-    coord_b1875 = SkyCoord(
-        ra=ra_hours * u.hourangle,
-        dec=dec_degrees * u.deg,
-        frame=FK4(equinox='B1875')
-    )
+    ra_rad = np.asarray(ra_hours, dtype=np.float64) * (np.pi / 12.0)
+    dec_rad = np.radians(np.asarray(dec_degrees, dtype=np.float64))
     
-    # Transform to ICRS (equivalent to J2000 for most purposes)
-    coord_icrs = coord_b1875.icrs
+    # Unit vectors, shape (3, N)
+    cos_dec = np.cos(dec_rad)
+    xyz = np.stack([
+        cos_dec * np.cos(ra_rad),
+        cos_dec * np.sin(ra_rad),
+        np.sin(dec_rad),
+    ])
     
-    return coord_icrs.ra.hour, coord_icrs.dec.deg
+    # Remove E-terms of aberration and renormalize
+    xyz = xyz - _B1875_E_TERMS[:, None] + (_B1875_E_TERMS @ xyz) * xyz
+    xyz /= np.linalg.norm(xyz, axis=0)
+    
+    x, y, z = _B1875_TO_ICRS @ xyz
+    
+    ra_icrs = np.mod(np.arctan2(y, x) * (12.0 / np.pi), 24.0)
+    dec_icrs = np.degrees(np.arctan2(z, np.hypot(x, y)))
+    
+    return ra_icrs, dec_icrs
+
+
+def _boundary_cache_key(boundary_file: Path) -> str:
+    """
+    Hash everything that determines the generated boundary polygons.
+    
+    Args:
+        boundary_file: Path to constbnd.dat
+        
+    Returns:
+        Hex digest identifying one set of inputs
+        
+    Note:
+        Includes whether precession ran, so B1875 output produced without
+        Astropy is never served once Astropy is installed, and
+        _BOUNDARY_CACHE_VERSION, so algorithm changes invalidate old output.
+    """
+    digest = hashlib.md5(boundary_file.read_bytes())
+    digest.update(
+        f"v{_BOUNDARY_CACHE_VERSION}|"
+        f"{BOUNDARY_DENSIFICATION_STEPS}|{BOUNDARY_GAP_THRESHOLD_SQ}|"
+        f"{COORDINATE_DECIMALS}|{HAS_ASTROPY}".encode()
+    )
+    return digest.hexdigest()
 
 
 def generate_boundaries_j2000(data_dir: Path) -> Dict[str, List[List[float]]]:
@@ -206,9 +394,10 @@ def generate_boundaries_j2000(data_dir: Path) -> Dict[str, List[List[float]]]:
     
     Pipeline:
     1. Download IAU boundary definitions (B1875 coordinates)
+       (return cached result if these inputs were processed before)
     2. Parse into polygons per constellation
     3. Densify polygon edges via interpolation
-    4. Precess from B1875 to J2000
+    4. Precess from B1875 to J2000 (all constellations in one batch)
     5. Round and format for JSON export
     
     Args:
@@ -237,27 +426,62 @@ def generate_boundaries_j2000(data_dir: Path) -> Dict[str, List[List[float]]]:
     data_path = Path(data_dir)
     data_path.mkdir(parents=True, exist_ok=True)
     
-    # Download and parse
+    # Download
     boundary_file = _download_boundary_data(data_path)
+    
+    # Output is deterministic for a given input file and settings
+    cache_path = data_path / f"boundaries_{_boundary_cache_key(boundary_file)}.json"
+    if cache_path.exists():
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                boundaries_j2000 = json.load(f)
+            log(f"Using cached boundary polygons from {cache_path}", "success")
+            return boundaries_j2000
+        except (ValueError, OSError) as e:
+            log(f"Boundary cache unreadable ({e}), regenerating", "warn")
+    
+    # Parse
     raw_boundaries = _parse_boundary_file(boundary_file)
     
-    # Process each constellation
+    if not raw_boundaries:
+        log("No boundary polygons parsed", "warn")
+        return {}
+    
+    # Densify each constellation
+    names = list(raw_boundaries.keys())
+    dense = [
+        _densify_polygon(points, BOUNDARY_DENSIFICATION_STEPS)
+        for points in raw_boundaries.values()
+    ]
+    
+    # Precess all points in a single batch, then split back per constellation.
+    # One vectorized call avoids paying the per-call setup cost once for
+    # every constellation.
+    offsets = np.cumsum([len(ra) for ra, _ in dense])[:-1]
+    ra_j2000, dec_j2000 = _precess_coordinates(
+        np.concatenate([ra for ra, _ in dense]),
+        np.concatenate([dec for _, dec in dense])
+    )
+    
     boundaries_j2000: Dict[str, List[List[float]]] = {}
     
-    for constellation, points in raw_boundaries.items():
-        # Densify
-        ra_dense, dec_dense = _densify_polygon(points, BOUNDARY_DENSIFICATION_STEPS)
-        
-        # Precess
-        ra_j2000, dec_j2000 = _precess_coordinates(ra_dense, dec_dense)
-        
+    for constellation, ra_part, dec_part in zip(
+        names,
+        np.split(ra_j2000, offsets),
+        np.split(dec_j2000, offsets)
+    ):
         # Format for JSON: [[RA, Dec], [RA, Dec], ...]
-        formatted_points = [
-            [round(float(ra), 5), round(float(dec), 5)]
-            for ra, dec in zip(ra_j2000, dec_j2000)
+        boundaries_j2000[constellation] = [
+            [round(ra, COORDINATE_DECIMALS), round(dec, COORDINATE_DECIMALS)]
+            for ra, dec in zip(ra_part.tolist(), dec_part.tolist())
         ]
-        
-        boundaries_j2000[constellation] = formatted_points
+    
+    write_atomic(cache_path, json.dumps(boundaries_j2000).encode('utf-8'))
+    
+    # Drop polygons cached under older keys; they can never be hit again
+    for stale_path in data_path.glob("boundaries_*.json"):
+        if stale_path != cache_path:
+            stale_path.unlink(missing_ok=True)
     
     log(f"Generated {len(boundaries_j2000)} boundary polygons", "success")
     return boundaries_j2000
\ No newline at end of file
@@ -6,17 +6,21 @@ for the web frontend.
 """
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional
 
+import numpy as np
 from skyfield.api import Star, load_constellation_map, Loader
 
 from .boundaries import generate_boundaries_j2000
 from .config import (
     BOUNDARIES_FILENAME,
+    COORDINATE_DECIMALS,
     LINES_FILENAME,
     MAX_MAGNITUDE,
     NAMES_CACHE_FILENAME,
+    PRETTY_JSON,
     SKYFIELD_DATA_DIR,
     STARS_FILENAME,
     ensure_output_dir,
@@ -28,6 +32,14 @@ from .simbad_names import fetch_star_names
 from .stellarium_lines import fetch_constellation_lines
 
 
+# orjson is optional; much faster than the stdlib encoder for stars.json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
 def _assign_constellations(
     filtered_df,
     load: Loader
@@ -63,8 +75,8 @@ def _assign_constellations(
         observer_position.observe(star_objects)
     )
     
-    # Convert to list of strings
-    constellation_list = [str(c) for c in constellations]
+    # Skyfield returns a NumPy string array; convert in one C-level pass
+    constellation_list = np.asarray(constellations).astype(str).tolist()
     
     log(f"Assigned {len(constellation_list)} stars to constellations", "success")
     return constellation_list
@@ -92,30 +104,38 @@ def _build_star_catalog(
             "p": "Rigel",          # Proper name (optional)
             "b": "Beta Orionis",   # Bayer designation (optional)
             "m": 0.18,             # Apparent magnitude
-            "r": 5.24226,          # RA in hours (not degrees!)
-            "d": -8.20164,         # Dec in degrees
+            "r": 5.2423,           # RA in hours (not degrees!)
+            "d": -8.2016,          # Dec in degrees
             "c": "Ori"             # Constellation abbreviation
         }
     """
     log_step("Building Star Catalog")
     
+    # Pull columns out once; per-row .iloc access is the expensive part.
+    # Rounding stays in Python: np.round can differ in the last digit.
+    hip_ids = filtered_df.index.to_numpy(dtype=np.int64).tolist()
+    magnitudes = filtered_df['magnitude'].to_numpy(dtype=np.float64).tolist()
+    ra_hours = (
+        filtered_df['ra_degrees'].to_numpy(dtype=np.float64) / 15.0  # deg -> hours
+    ).tolist()
+    decs = filtered_df['dec_degrees'].to_numpy(dtype=np.float64).tolist()
+    
     catalog = []
     
-    for i, hip_id in enumerate(filtered_df.index):
-        row = filtered_df.iloc[i]
-        names = name_data.get(int(hip_id), {})
+    for hip_id, mag, ra, dec, const in zip(
+        hip_ids, magnitudes, ra_hours, decs, constellations
+    ):
+        names = name_data.get(hip_id, {})
         
-        star_entry = {
-            "id": int(hip_id),
+        catalog.append({
+            "id": hip_id,
             "p": names.get('p'),  # Proper name (None if not found)
             "b": names.get('b'),  # Bayer name (None if not found)
-            "m": round(float(row['magnitude']), 2),
-            "r": round(float(row['ra_degrees']) / 15.0, 5),  # Convert deg -> hours
-            "d": round(float(row['dec_degrees']), 5),
-            "c": constellations[i]
-        }
-        
-        catalog.append(star_entry)
+            "m": round(mag, 2),
+            "r": round(ra, COORDINATE_DECIMALS),  # RA in hours
+            "d": round(dec, COORDINATE_DECIMALS),
+            "c": const
+        })
     
     log(f"Catalog contains {len(catalog)} stars", "success")
     return catalog
@@ -129,9 +149,25 @@ def _write_json_file(data: any, output_path: Path, description: str) -> None:
         data: Python object to serialize
         output_path: Target file path
         description: Human-readable description for logging
+        
+    Note:
+        Uses orjson when installed (also accepts NumPy arrays/scalars),
+        otherwise falls back to the stdlib json module. Output is compact
+        unless PRETTY_JSON is enabled.
     """
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+    if HAS_ORJSON:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if PRETTY_JSON:
+            option |= orjson.OPT_INDENT_2
+        
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=option))
+    else:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            if PRETTY_JSON:
+                json.dump(data, f, indent=2)
+            else:
+                json.dump(data, f, separators=(',', ':'))
     
     log(f"{description} written to {output_path}", "success")
 
@@ -146,8 +182,9 @@ def build_atlas(output_dir: Path = Path("web")) -> None:
     3. Filter stars (bright + line-required stars)
     4. Assign IAU constellations
     5. Resolve star names via SIMBAD
-    6. Generate constellation boundaries
-    7. Write JSON output files
+    6. Build star catalog
+    7. Generate constellation boundaries
+    8. Write JSON output files
     
     Args:
         output_dir: Directory for output files (default: "web")
@@ -161,6 +198,8 @@ def build_atlas(output_dir: Path = Path("web")) -> None:
     Note:
         RA coordinates in output are in HOURS (not degrees).
         This is required by the Astronomy Engine library used by frontend.
+        Steps 1, 2 and 7 run concurrently in worker threads, so their log
+        output may interleave.
         
     Raises:
         IOError: If file operations fail
@@ -176,32 +215,45 @@ def build_atlas(output_dir: Path = Path("web")) -> None:
     skyfield_data_path.mkdir(parents=True, exist_ok=True)
     load = Loader(SKYFIELD_DATA_DIR)
     
-    # Step 1: Load Hipparcos
-    hipparcos_df = load_hipparcos_catalog()
-    
-    # Step 2: Fetch constellation lines
-    lines_by_const, required_hip_ids = fetch_constellation_lines()
-    
-    # Step 3: Filter stars
-    filtered_df = filter_stars_by_magnitude(
-        hipparcos_df,
-        MAX_MAGNITUDE,
-        required_hip_ids
-    )
-    
-    # Step 4: Assign constellations
-    constellations = _assign_constellations(filtered_df, load)
-    
-    # Step 5: Resolve names
-    hip_ids_to_query = set(int(h) for h in filtered_df.index)
-    cache_path = output_dir / NAMES_CACHE_FILENAME
-    name_data = fetch_star_names(hip_ids_to_query, cache_path)
-    
-    # Step 6: Build catalog
-    star_catalog = _build_star_catalog(filtered_df, constellations, name_data)
-    
-    # Step 7: Generate boundaries
-    boundaries = generate_boundaries_j2000(skyfield_data_path)
+    # Steps 1, 2 and 7 download from independent servers and don't depend
+    # on each other, so start them together and collect each when needed
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        hipparcos_future = executor.submit(load_hipparcos_catalog)
+        lines_future = executor.submit(
+            fetch_constellation_lines,
+            skyfield_data_path
+        )
+        boundaries_future = executor.submit(
+            generate_boundaries_j2000,
+            skyfield_data_path
+        )
+        
+        # Step 1: Load Hipparcos
+        hipparcos_df = hipparcos_future.result()
+        
+        # Step 2: Fetch constellation lines
+        lines_by_const, required_hip_ids = lines_future.result()
+        
+        # Step 3: Filter stars
+        filtered_df = filter_stars_by_magnitude(
+            hipparcos_df,
+            MAX_MAGNITUDE,
+            required_hip_ids
+        )
+        
+        # Step 4: Assign constellations
+        constellations = _assign_constellations(filtered_df, load)
+        
+        # Step 5: Resolve names
+        hip_ids_to_query = set(int(h) for h in filtered_df.index)
+        cache_path = output_dir / NAMES_CACHE_FILENAME
+        name_data = fetch_star_names(hip_ids_to_query, cache_path)
+        
+        # Step 6: Build catalog
+        star_catalog = _build_star_catalog(filtered_df, constellations, name_data)
+        
+        # Step 7: Generate boundaries
+        boundaries = boundaries_future.result()
     
     # Step 8: Write outputs
     log_step("Writing Output Files")
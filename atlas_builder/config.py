@@ -5,6 +5,7 @@ Centralizes all magic numbers, file paths, and thresholds to make
 build behavior explicit and easily modifiable.
 """
 
+import os
 from pathlib import Path
 from typing import Final
 
@@ -16,6 +17,12 @@ BOUNDARIES_FILENAME: Final[str] = "boundaries.json"
 LINES_FILENAME: Final[str] = "lines.json"
 NAMES_CACHE_FILENAME: Final[str] = "names_cache.json"
 
+PRETTY_JSON: Final[bool] = os.environ.get("ATLAS_PRETTY_JSON") == "1"
+"""
+Indent output JSON for debugging (set ATLAS_PRETTY_JSON=1).
+Default is compact output, which is ~3x smaller for stars.json.
+"""
+
 # --- Catalog Filtering ---
 MAX_MAGNITUDE: Final[float] = 6.0
 """
@@ -68,6 +75,12 @@ SIMBAD_CHUNK_SIZE: Final[int] = 500
 SIMBAD_TIMEOUT_SECONDS: Final[int] = 30
 """HTTP timeout for SIMBAD queries."""
 
+SIMBAD_MAX_WORKERS: Final[int] = 4
+"""
+Maximum number of SIMBAD chunk queries in flight at once.
+Kept small to stay within SIMBAD's rate limits.
+"""
+
 # --- Boundary Processing ---
 BOUNDARY_DENSIFICATION_STEPS: Final[int] = 10
 """
@@ -86,6 +99,13 @@ Used to handle split constellations like Serpens.
 RA_WRAP_HOURS: Final[float] = 24.0
 DEGREES_PER_HOUR: Final[float] = 15.0
 
+COORDINATE_DECIMALS: Final[int] = 4
+"""
+Decimal places kept for output RA (hours) and Dec (degrees).
+4 places is ~5 arcsec in RA and ~0.4 arcsec in Dec, well below what
+the atlas can display, and keeps the JSON files small.
+"""
+
 
 def ensure_output_dir(output_dir: Path) -> None:
     """
@@ -6,10 +6,12 @@ automatic caching and preprocessing. The catalog is the foundation
 of the star atlas.
 """
 
+import functools
 import os
 from pathlib import Path
 from typing import Set
 
+import numpy as np
 import pandas as pd
 from skyfield.api import Loader
 from skyfield.data import hipparcos
@@ -18,6 +20,7 @@ from .config import MAX_MAGNITUDE, SKYFIELD_DATA_DIR
 from .logging_utils import log, log_step
 
 
+@functools.lru_cache(maxsize=1)
 def load_hipparcos_catalog() -> pd.DataFrame:
     """
     Download and load the complete Hipparcos star catalog.
@@ -34,6 +37,8 @@ def load_hipparcos_catalog() -> pd.DataFrame:
         
     Note:
         Creates SKYFIELD_DATA_DIR if it doesn't exist.
+        Memoized in-process: repeated calls return the same DataFrame,
+        so callers must not modify it in place. See clear_cache().
     """
     log_step("Loading Hipparcos Catalog")
     
@@ -50,6 +55,11 @@ def load_hipparcos_catalog() -> pd.DataFrame:
     return df
 
 
+def clear_cache() -> None:
+    """Drop the memoized catalog so the next load re-reads it from disk."""
+    load_hipparcos_catalog.cache_clear()
+
+
 def filter_stars_by_magnitude(
     df: pd.DataFrame,
     max_magnitude: float,
@@ -85,8 +95,15 @@ def filter_stars_by_magnitude(
     # Mask 1: Bright stars
     mask_bright = df['magnitude'] <= max_magnitude
     
-    # Mask 2: Stars used in constellation lines
-    mask_required = df.index.isin(required_hip_ids)
+    # Mask 2: Stars used in constellation lines (sorted int array lets
+    # np.isin take its C search path instead of hashing Python objects)
+    required = np.fromiter(
+        required_hip_ids, dtype=np.int64, count=len(required_hip_ids)
+    )
+    required.sort()
+    mask_required = np.isin(
+        df.index.to_numpy(dtype=np.int64), required, assume_unique=True
+    )
     
     # Combined: bright OR required
     combined_mask = mask_bright | mask_required
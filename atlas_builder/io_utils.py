@@ -0,0 +1,27 @@
+"""
+File helpers for the atlas builder pipeline.
+
+Shared by the modules that keep on-disk caches between builds.
+"""
+
+import os
+from pathlib import Path
+
+
+def write_atomic(path: Path, content: bytes) -> None:
+    """
+    Write bytes to a file without ever exposing a partial write.
+
+    Args:
+        path: Target file path
+        content: Complete file contents
+
+    Note:
+        Writes a sibling ".tmp" file and renames it over the target, so an
+        interrupted build leaves either the old file or the new one, never
+        a truncated cache that later builds would fail to parse.
+    """
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
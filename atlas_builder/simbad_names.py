@@ -10,15 +10,26 @@ Uses aggressive caching to avoid repeated network queries.
 
 import json
 import re
+import string
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, Iterable, Iterator, List, Optional, Set
 
 from astroquery.simbad import Simbad
 
-from .config import SIMBAD_CHUNK_SIZE
+from .config import SIMBAD_CHUNK_SIZE, SIMBAD_MAX_WORKERS
+from .io_utils import write_atomic
 from .logging_utils import log, log_step
 
 
+# orjson is optional; faster load/save for large name caches
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
 # Greek letter abbreviations used by SIMBAD
 SIMBAD_GREEK_LETTERS = {
     "alf": "Alpha", "bet": "Beta", "gam": "Gamma", "del": "Delta",
@@ -64,6 +75,28 @@ CONSTELLATION_GENITIVES = {
 }
 
 
+# Bayer token: (optional number) (3-letter greek abbreviation) (optional number)
+_GREEK_PATTERN = re.compile(r"(?:^|\s)(\d+)?\s*([a-zA-Z]{3})\s*(\d+)?(?:$|\s)")
+
+# "HIP 27989" identifier; case-insensitive like SIMBAD's own catalog names
+_HIP_RE = re.compile(r"HIP\s+(\d+)(?:\s|$)", re.IGNORECASE)
+
+# Object-type markers SIMBAD puts in front of identifiers (e.g. "V* alf Ori")
+_ID_PREFIXES = ("V* ", "* ")
+
+# Identifier-list column added by add_votable_fields("ids"); astroquery
+# versions disagree on its case ("IDS" vs "ids")
+_IDS_COLUMN = "IDS"
+
+# Proper-name identifier: "NAME-IAU Betelgeuse" (preferred) or "NAME Garnet Star"
+_NAME_RE = re.compile(r"^(NAME-IAU|NAME)\s+(.+)$", re.IGNORECASE)
+
+# str.translate table deleting every Latin-1 character except ASCII letters
+_KEEP_ALPHA = str.maketrans(
+    "", "", "".join(chr(c) for c in range(256) if chr(c) not in string.ascii_letters)
+)
+
+
 class StarNameCache:
     """
     Local JSON cache for star name resolution results.
@@ -77,6 +110,9 @@ class StarNameCache:
     Keys:
         p = proper name (IAU or common)
         b = Bayer designation
+        
+    Stars SIMBAD returned nothing for are cached with both keys null,
+    so they are not re-queried on every build.
     """
     
     def __init__(self, cache_path: Path):
@@ -91,23 +127,44 @@ class StarNameCache:
         
         if cache_path.exists():
             try:
-                with open(cache_path, 'r', encoding='utf-8') as f:
-                    raw = json.load(f)
+                with open(cache_path, 'rb') as f:
+                    raw = orjson.loads(f.read()) if HAS_ORJSON else json.load(f)
                     # Convert string keys back to integers
-                    self.data = {int(k): v for k, v in raw.items()}
+                    self.data = dict(zip(map(int, raw), raw.values()))
                 log(f"Loaded {len(self.data)} cached star names", "success")
             except Exception as e:
                 log(f"Cache load failed: {e}", "warn")
     
     def save(self) -> None:
-        """Write cache to disk."""
-        with open(self.cache_path, 'w', encoding='utf-8') as f:
-            json.dump(self.data, f, indent=2)
+        """
+        Write cache to disk.
+        
+        Writes a temporary file and renames it over the cache, so an
+        interrupted save never leaves a truncated cache behind.
+        """
+        if HAS_ORJSON:
+            content = orjson.dumps(
+                self.data,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            )
+        else:
+            content = json.dumps(self.data, indent=2).encode('utf-8')
+        
+        write_atomic(self.cache_path, content)
     
     def get(self, hip_id: int) -> Optional[Dict[str, Optional[str]]]:
         """Retrieve cached entry."""
         return self.data.get(hip_id)
     
+    def known(self, hip_id: int) -> bool:
+        """
+        Check whether a star has been queried before.
+        
+        True also for negative entries ({"p": None, "b": None}), which
+        record that SIMBAD had no names for the star.
+        """
+        return hip_id in self.data
+    
     def update(self, new_data: Dict[int, Dict[str, Optional[str]]]) -> None:
         """Merge new results into cache."""
         self.data.update(new_data)
@@ -115,33 +172,45 @@ class StarNameCache:
 
 def _normalize_greek_token(token: str) -> str:
     """Remove non-alphabetic characters and lowercase."""
-    return re.sub(r"[^A-Za-z]", "", token).lower()
+    return token.translate(_KEEP_ALPHA).lower()
 
 
-def _parse_simbad_ids(ids_field) -> List[str]:
+def _strip_prefixes(raw_id: str) -> str:
+    """Remove a leading SIMBAD object-type marker and surrounding whitespace."""
+    for prefix in _ID_PREFIXES:
+        if raw_id.startswith(prefix):
+            raw_id = raw_id[len(prefix):]
+            break
+    return raw_id.strip()
+
+
+def _iter_simbad_ids(ids_field) -> Iterator[str]:
     """
     Parse SIMBAD's pipe-separated identifier field.
     
     Args:
         ids_field: Raw IDS column value (bytes or str)
         
-    Returns:
-        List of cleaned identifier strings
+    Yields:
+        Cleaned, non-empty identifier strings
     """
     if isinstance(ids_field, (bytes, bytearray)):
         s = ids_field.decode("utf-8")
     else:
         s = str(ids_field)
     
-    return [x.strip() for x in s.split("|") if x.strip()]
+    for x in s.split("|"):
+        x = x.strip()
+        if x:
+            yield x
 
 
-def _extract_hip_from_ids(ids: List[str]) -> Optional[int]:
+def _extract_hip_from_ids(ids: Iterable[str]) -> Optional[int]:
     """
     Find HIP identifier in SIMBAD identifier list.
     
     Args:
-        ids: List of identifier strings
+        ids: Identifier strings
         
     Returns:
         Hipparcos catalog number or None
@@ -151,15 +220,13 @@ def _extract_hip_from_ids(ids: List[str]) -> Optional[int]:
         27989
     """
     for ident in ids:
-        if ident.upper().startswith("HIP "):
-            try:
-                return int(ident.split()[1])
-            except (IndexError, ValueError):
-                continue
+        match = _HIP_RE.match(ident)
+        if match:
+            return int(match.group(1))
     return None
 
 
-def _parse_bayer_designation(ids: List[str]) -> Optional[str]:
+def _parse_bayer_designation(ids: Iterable[str]) -> Optional[str]:
     """
     Extract and format Bayer designation from SIMBAD identifiers.
     
@@ -169,17 +236,14 @@ def _parse_bayer_designation(ids: List[str]) -> Optional[str]:
     - "pi 3 Ori" -> "Pi3 Orionis"
     
     Args:
-        ids: List of SIMBAD identifiers
+        ids: SIMBAD identifier strings
         
     Returns:
         Formatted Bayer name or None
     """
-    # Regex to match: (optional number) (greek letter) (optional number)
-    greek_pattern = re.compile(r"(?:^|\s)(\d+)?\s*([a-zA-Z]{3})\s*(\d+)?(?:$|\s)")
-    
     for raw_id in ids:
         # Strip common prefixes
-        clean_id = raw_id.replace("* ", "").replace("V* ", "").strip()
+        clean_id = _strip_prefixes(raw_id)
         parts = clean_id.split()
         
         if len(parts) < 2:
@@ -192,10 +256,16 @@ def _parse_bayer_designation(ids: List[str]) -> Optional[str]:
         if not genitive:
             continue
         
+        # Fast path: plain "alf Ori" form, by far the most common
+        if len(parts) == 2:
+            greek_name = SIMBAD_GREEK_LETTERS.get(parts[0].lower())
+            if greek_name:
+                return f"{greek_name} {genitive}"
+        
         # Join prefix parts (e.g., "1 tau" or "pi 3")
         prefix = " ".join(parts[:-1])
         
-        match = greek_pattern.search(prefix)
+        match = _GREEK_PATTERN.search(prefix)
         if not match:
             continue
         
@@ -212,6 +282,92 @@ def _parse_bayer_designation(ids: List[str]) -> Optional[str]:
     return None
 
 
+def _with_negative_entries(
+    new_data: Dict[int, Dict[str, Optional[str]]],
+    chunk: List[int]
+) -> Dict[int, Dict[str, Optional[str]]]:
+    """Add a null-name entry for every queried star SIMBAD didn't resolve."""
+    for hip in chunk:
+        new_data.setdefault(hip, {"p": None, "b": None})
+    return new_data
+
+
+def _resolve_chunk(
+    chunk_number: int,
+    chunk: List[int]
+) -> Dict[int, Dict[str, Optional[str]]]:
+    """
+    Query SIMBAD for one chunk of Hipparcos IDs and parse the names.
+    
+    Args:
+        chunk_number: 1-based chunk index (for logging)
+        chunk: Hipparcos catalog numbers to query
+        
+    Returns:
+        Dict mapping HIP ID to name data for every star in the chunk
+        (null names if SIMBAD had none). On a query error, only what
+        was parsed before the error.
+    """
+    new_data: Dict[int, Dict[str, Optional[str]]] = {}
+    query_list = [f"HIP {h}" for h in chunk]
+    
+    try:
+        table = Simbad.query_objects(query_list)
+        
+        if not table:
+            log(f"Chunk {chunk_number}: No results", "warn")
+            return _with_negative_entries(new_data, chunk)
+        
+        # Find IDS column (case-insensitive)
+        id_col = next(
+            (c for c in table.colnames if c.upper() == _IDS_COLUMN), None
+        )
+        
+        if not id_col:
+            log("IDS column not found in SIMBAD response", "warn")
+            return new_data
+        
+        # Pull the column out once; per-row table access is slow in astropy
+        ids_col_data = list(table[id_col])
+        
+        for ids_raw in ids_col_data:
+            # Scanned up to three times below (HIP, proper, Bayer)
+            ids_list = list(_iter_simbad_ids(ids_raw))
+            hip = _extract_hip_from_ids(ids_list)
+            
+            if not hip:
+                continue
+            
+            proper_name: Optional[str] = None
+            bayer_name: Optional[str] = None
+            
+            # Priority 1: Proper names (first NAME-IAU, else first NAME)
+            best_rank = 99
+            for raw_id in ids_list:
+                match = _NAME_RE.match(_strip_prefixes(raw_id))
+                if not match:
+                    continue
+                
+                rank = 0 if match.group(1).upper() == "NAME-IAU" else 1
+                if rank < best_rank:
+                    proper_name, best_rank = match.group(2).strip(), rank
+                    if rank == 0:
+                        break
+            
+            # Priority 2: Bayer designation
+            if not bayer_name:
+                bayer_name = _parse_bayer_designation(ids_list)
+            
+            new_data[hip] = {"p": proper_name, "b": bayer_name}
+    
+    except Exception as e:
+        # Don't negative-cache: the failure may be transient
+        log(f"Chunk {chunk_number} error: {e}", "error")
+        return new_data
+    
+    return _with_negative_entries(new_data, chunk)
+
+
 def fetch_star_names(
     hip_ids: Set[int],
     cache_path: Path
@@ -220,7 +376,7 @@ def fetch_star_names(
     Resolve star names for a set of Hipparcos IDs using SIMBAD.
     
     Uses local cache to minimize network queries. Queries SIMBAD
-    in chunks to respect rate limits.
+    in chunks, a few concurrently, bounded to respect rate limits.
     
     Args:
         hip_ids: Set of Hipparcos catalog numbers
@@ -238,69 +394,41 @@ def fetch_star_names(
     
     cache = StarNameCache(cache_path)
     
-    # Identify stars not in cache
-    to_fetch = [h for h in hip_ids if cache.get(h) is None]
+    # Identify stars not in cache; sorted so chunk boundaries are
+    # reproducible from build to build
+    to_fetch = sorted({int(h) for h in hip_ids if not cache.known(h)})
     
     if not to_fetch:
         log("All names found in cache", "success")
         return cache.data
     
     log(f"Querying SIMBAD for {len(to_fetch)} stars")
-    log(f"(Processing in chunks of {SIMBAD_CHUNK_SIZE})")
+    log(
+        f"(Processing in chunks of {SIMBAD_CHUNK_SIZE}, "
+        f"up to {SIMBAD_MAX_WORKERS} at a time)"
+    )
     
     # Configure SIMBAD to return identifier lists
     Simbad.reset_votable_fields()
     Simbad.add_votable_fields("ids")
     
+    chunks = [
+        to_fetch[i:i + SIMBAD_CHUNK_SIZE]
+        for i in range(0, len(to_fetch), SIMBAD_CHUNK_SIZE)
+    ]
+    
     new_data: Dict[int, Dict[str, Optional[str]]] = {}
     
-    for i in range(0, len(to_fetch), SIMBAD_CHUNK_SIZE):
-        chunk = to_fetch[i:i + SIMBAD_CHUNK_SIZE]
-        query_list = [f"HIP {h}" for h in chunk]
-        
-        try:
-            table = Simbad.query_objects(query_list)
-            
-            if not table:
-                log(f"Chunk {i//SIMBAD_CHUNK_SIZE + 1}: No results", "warn")
-                continue
-            
-            # Find IDS column (case-insensitive)
-            cols = {c.upper(): c for c in table.colnames}
-            id_col = cols.get("IDS")
-            
-            if not id_col:
-                log("IDS column not found in SIMBAD response", "warn")
-                continue
-            
-            for row in table:
-                ids_list = _parse_simbad_ids(row[id_col])
-                hip = _extract_hip_from_ids(ids_list)
-                
-                if not hip:
-                    continue
-                
-                proper_name: Optional[str] = None
-                bayer_name: Optional[str] = None
-                
-                # Priority 1: Proper names
-                for raw_id in ids_list:
-                    clean = raw_id.replace("* ", "").replace("V* ", "").strip()
-                    
-                    if clean.upper().startswith("NAME-IAU "):
-                        proper_name = clean[9:].strip()
-                        break
-                    elif clean.upper().startswith("NAME ") and proper_name is None:
-                        proper_name = clean[5:].strip()
-                
-                # Priority 2: Bayer designation
-                if not bayer_name:
-                    bayer_name = _parse_bayer_designation(ids_list)
-                
-                new_data[hip] = {"p": proper_name, "b": bayer_name}
-        
-        except Exception as e:
-            log(f"Chunk {i//SIMBAD_CHUNK_SIZE + 1} error: {e}", "error")
+    # Each chunk is one blocking HTTP round-trip; overlap a few of them
+    with ThreadPoolExecutor(
+        max_workers=min(SIMBAD_MAX_WORKERS, len(chunks))
+    ) as executor:
+        for chunk_data in executor.map(
+            _resolve_chunk,
+            range(1, len(chunks) + 1),
+            chunks
+        ):
+            new_data.update(chunk_data)
     
     if new_data:
         cache.update(new_data)
@@ -5,15 +5,46 @@ Fetches and parses Stellarium's modern sky culture to extract
 constellation stick figures as HIP ID pairs.
 """
 
+import json
 import re
+from pathlib import Path
 from typing import Dict, List, Set, Tuple
 
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from .config import SIMBAD_TIMEOUT_SECONDS, get_stellarium_lines_url
+from .config import (
+    SIMBAD_TIMEOUT_SECONDS,
+    SKYFIELD_DATA_DIR,
+    STELLARIUM_SKYCULTURE,
+    get_stellarium_lines_url,
+)
+from .io_utils import write_atomic
 from .logging_utils import log, log_step
 
 
+# orjson is optional; faster decode of the several-hundred-KB index.json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Keep-alive session with retry/backoff for transient server errors.
+# requests already negotiates gzip via its default Accept-Encoding.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[502, 503, 504]
+    ))
+)
+
+
 # Constellation ID normalization map
 # Maps Stellarium's uppercase codes to canonical mixed-case abbreviations
 CONSTELLATION_CANONICAL_IDS = {
@@ -37,11 +68,67 @@ CONSTELLATION_CANONICAL_IDS = {
     "VIR": "Vir", "VOL": "Vol", "VUL": "Vul"
 }
 
+# Same map keyed by the casings Stellarium actually uses (upper, lower and
+# canonical), so the common case needs no per-constellation .upper()
+_CANONICAL_ANY_CASE = {
+    **{k.lower(): v for k, v in CONSTELLATION_CANONICAL_IDS.items()},
+    **{v: v for v in CONSTELLATION_CANONICAL_IDS.values()},
+    **CONSTELLATION_CANONICAL_IDS,
+}
 
-def fetch_constellation_lines() -> Tuple[Dict[str, List[List[int]]], Set[int]]:
+
+def _download_stellarium_index(url: str, data_dir: Path) -> bytes:
+    """
+    Download Stellarium's index.json, revalidating a local copy by ETag.
+    
+    Args:
+        url: index.json URL for the configured skyculture
+        data_dir: Directory holding the cached copy and its ETag
+        
+    Returns:
+        Raw JSON body (from the server, or from disk on 304 Not Modified)
+        
+    Note:
+        The body is written before its ETag, so an interrupted save can
+        at worst cause one redundant full download on the next build.
+    """
+    cache_path = data_dir / f"stellarium_{STELLARIUM_SKYCULTURE}.json"
+    etag_path = cache_path.with_suffix(".etag")
+    
+    headers = {}
+    if cache_path.exists() and etag_path.exists():
+        headers["If-None-Match"] = etag_path.read_text(encoding="utf-8").strip()
+    
+    response = _SESSION.get(url, headers=headers, timeout=SIMBAD_TIMEOUT_SECONDS)
+    
+    if response.status_code == 304:
+        log(f"Unchanged since last build, using {cache_path}", "success")
+        return cache_path.read_bytes()
+    
+    response.raise_for_status()
+    body = response.content
+    
+    data_dir.mkdir(parents=True, exist_ok=True)
+    write_atomic(cache_path, body)
+    
+    etag = response.headers.get("ETag")
+    if etag:
+        write_atomic(etag_path, etag.encode("utf-8"))
+    elif etag_path.exists():
+        etag_path.unlink()
+    
+    return body
+
+
+def fetch_constellation_lines(
+    data_dir: Path = Path(SKYFIELD_DATA_DIR)
+) -> Tuple[Dict[str, List[List[int]]], Set[int]]:
     """
     Download and parse Stellarium's constellation line definitions.
     
+    Args:
+        data_dir: Directory for the cached index.json and its ETag
+        
     Returns:
         Tuple of:
         - lines_by_constellation: Dict mapping constellation ID to list of line pairs
@@ -54,6 +141,7 @@ def fetch_constellation_lines() -> Tuple[Dict[str, List[List[int]]], Set[int]]:
         
     Note:
         Fetches from Stellarium based on STELLARIUM_SKYCULTURE config.
+        Repeat builds send If-None-Match and reuse the cached copy on 304.
         ID format is "CON <skyculture> XXX" where XXX is the 3-letter code.
         
     Example:
@@ -66,12 +154,11 @@ def fetch_constellation_lines() -> Tuple[Dict[str, List[List[int]]], Set[int]]:
     url = get_stellarium_lines_url()
     log_step("Fetching Constellation Lines", f"Source: {url}")
     
-    response = requests.get(url, timeout=SIMBAD_TIMEOUT_SECONDS)
-    response.raise_for_status()
-    data = response.json()
+    body = _download_stellarium_index(url, data_dir)
+    data = orjson.loads(body) if HAS_ORJSON else json.loads(body)
     
     lines_by_constellation: Dict[str, List[List[int]]] = {}
-    required_hip_ids: Set[int] = set()
+    global_ids: List[np.ndarray] = []
     
     constellations = data.get("constellations", [])
     if not constellations:
@@ -92,14 +179,14 @@ def fetch_constellation_lines() -> Tuple[Dict[str, List[List[int]]], Set[int]]:
         raw_abbr = parts[-1]  # Last part is the constellation abbreviation
         
         # Normalize to canonical format
-        const_id = CONSTELLATION_CANONICAL_IDS.get(
-            raw_abbr.upper(), 
-            raw_abbr
-        )
+        const_id = _CANONICAL_ANY_CASE.get(raw_abbr)
+        if const_id is None:
+            # Unusual casing (e.g. "oRI"): fall back to uppercasing
+            const_id = CONSTELLATION_CANONICAL_IDS.get(raw_abbr.upper(), raw_abbr)
         
         # Parse polylines into pair-wise segments
         polylines = const.get("lines") or []
-        line_pairs: List[List[int]] = []
+        pair_arrays: List[np.ndarray] = []
         
         for polyline in polylines:
             if not polyline or len(polyline) < 2:
@@ -107,28 +194,30 @@ def fetch_constellation_lines() -> Tuple[Dict[str, List[List[int]]], Set[int]]:
             
             # Format: simple arrays of integers [[1234, 5678, 9012]]
             try:
-                hip_sequence = [int(h) for h in polyline]
+                hip_sequence = np.asarray(polyline, dtype=np.int64)
             except (ValueError, TypeError):
                 continue
             
-            if len(hip_sequence) < 2:
+            if hip_sequence.ndim != 1 or hip_sequence.size < 2:
                 continue
             
             # Convert polyline [A, B, C, D] into pairs [[A,B], [B,C], [C,D]]
-            for i in range(len(hip_sequence) - 1):
-                hip_a = hip_sequence[i]
-                hip_b = hip_sequence[i + 1]
-                
-                line_pairs.append([hip_a, hip_b])
-                required_hip_ids.add(hip_a)
-                required_hip_ids.add(hip_b)
+            pair_arrays.append(
+                np.column_stack((hip_sequence[:-1], hip_sequence[1:]))
+            )
         
-        if line_pairs:
-            lines_by_constellation[const_id] = line_pairs
+        if pair_arrays:
+            # One concatenation and conversion per constellation
+            all_pairs = np.concatenate(pair_arrays, axis=0)
+            lines_by_constellation[const_id] = all_pairs.tolist()
+            global_ids.append(all_pairs.ravel())
     
     if not lines_by_constellation:
         raise RuntimeError("No valid constellation lines parsed")
     
+    # Deduplicate every referenced star in one sort-unique pass
+    required_hip_ids: Set[int] = set(np.unique(np.concatenate(global_ids)).tolist())
+    
     log(f"Parsed {len(lines_by_constellation)} constellations", "success")
     log(f"Total line segments: {sum(len(v) for v in lines_by_constellation.values())}")
     log(f"Unique stars in lines: {len(required_hip_ids)}")